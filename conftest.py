@@ -0,0 +1,91 @@
+"""
+Shared pytest fixtures.
+Agent and LangChain imports happen inside the fixtures so that collecting or
+selecting a subset of tests does not pay for loading langchain_groq up front.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+
+@pytest.fixture
+def mock_llm():
+    """Mocked ChatGroq client; agents under test never reach the network"""
+    from langchain_groq import ChatGroq
+    
+    return Mock(spec=ChatGroq)
+
+
+@pytest.fixture(scope="module")
+def parser_agent():
+    """DataParserAgent shared per module; it holds no per-run state"""
+    from src.agents.data_parser_agent import DataParserAgent
+    
+    return DataParserAgent()
+
+
+@pytest.fixture
+def question_agent(mock_llm):
+    """QuestionGeneratorAgent backed by a mocked LLM, with an in-process cache only"""
+    from src.agents.question_generator_agent_llm import QuestionGeneratorAgent
+    
+    # No SQLite L2: tests must not share on-disk cache state with main.py
+    return QuestionGeneratorAgent(llm=mock_llm, cache_path=None)
+
+
+@pytest.fixture
+def answer_agent(mock_llm):
+    """AnswerGeneratorAgent backed by a mocked LLM"""
+    from src.agents.answer_generator_agent_llm import AnswerGeneratorAgent
+    
+    return AnswerGeneratorAgent(llm=mock_llm)
+
+
+@pytest.fixture
+def comparison_agent(mock_llm):
+    """ComparisonAgentLLM backed by a mocked LLM"""
+    from src.agents.comparison_agent_llm import ComparisonAgentLLM
+    
+    return ComparisonAgentLLM(llm=mock_llm)
+
+
+@pytest.fixture
+def product_page_agent(mock_llm):
+    """ProductPageAgent backed by a mocked LLM"""
+    from src.agents.product_page_agent_llm import ProductPageAgent
+    
+    return ProductPageAgent(llm=mock_llm)
+
+
+def _load_output_page(file_name, adapter):
+    """Parse and validate an output page once; None when the pipeline hasn't produced it"""
+    from pathlib import Path
+    
+    path = Path("output") / file_name
+    if not path.exists():
+        return None
+    return adapter.validate_json(path.read_bytes())
+
+
+@pytest.fixture(scope="session")
+def faq_page_data():
+    """Validated output/faq_page.json, shared across the session"""
+    from src.models.outputs import FAQ_PAGE_ADAPTER
+    
+    return _load_output_page("faq_page.json", FAQ_PAGE_ADAPTER)
+
+
+@pytest.fixture(scope="session")
+def product_page_data():
+    """Validated output/product_page.json, shared across the session"""
+    from src.models.outputs import PRODUCT_PAGE_ADAPTER
+    
+    return _load_output_page("product_page.json", PRODUCT_PAGE_ADAPTER)
+
+
+@pytest.fixture(scope="session")
+def comparison_page_data():
+    """Validated output/comparison_page.json, shared across the session"""
+    from src.models.outputs import COMPARISON_PAGE_ADAPTER
+    
+    return _load_output_page("comparison_page.json", COMPARISON_PAGE_ADAPTER)
@@ -4,6 +4,7 @@ Generates intelligent answers for questions using AI.
 OPTIMIZED: Batch processing to reduce API calls from 20 to 1.
 """
 
+import re
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
@@ -12,6 +13,58 @@ from src.models.product import Product, CategorizedQuestion
 from typing import List
 
 
+def _answer_what_is(product: Product, question_lower: str) -> str:
+    return f"{product.name} is a {product.concentration} serum formulated for {product.skin_types_csv} skin types."
+
+
+def _answer_ingredients(product: Product, question_lower: str) -> str:
+    return f"{product.name} contains {product.ingredients_csv} as key active ingredients."
+
+
+def _answer_benefits(product: Product, question_lower: str) -> str:
+    return f"{product.name} provides {product.benefits_lower} benefits."
+
+
+def _answer_usage(product: Product, question_lower: str) -> str:
+    return product.usage_instructions
+
+
+def _answer_side_effects(product: Product, question_lower: str) -> str:
+    if product.side_effects and len(product.side_effects) > 20:
+        return product.side_effects
+    return "No significant side effects have been reported for this product. However, it's always recommended to perform a patch test before first use."
+
+
+def _answer_price(product: Product, question_lower: str) -> str:
+    return f"{product.name} is priced at {product.price}."
+
+
+def _answer_skin_type(product: Product, question_lower: str) -> str:
+    return f"{product.name} is suitable for {product.skin_types_csv} skin types."
+
+
+def _answer_generic(product: Product, question_lower: str) -> str:
+    return f"For detailed information about {question_lower.replace('?', '')}, please refer to the product documentation or consult with a skincare professional."
+
+
+# Fallback answer dispatch: (trigger substring, handler), in priority order
+_FALLBACK_TRIGGERS = (
+    ("what is", _answer_what_is),
+    ("ingredient", _answer_ingredients),
+    ("benefit", _answer_benefits),
+    ("how to use", _answer_usage),
+    ("how do i use", _answer_usage),
+    ("side effect", _answer_side_effects),
+    ("price", _answer_price),
+    ("skin type", _answer_skin_type),
+)
+
+# One alternation scans a question for every trigger in a single C-level pass
+_FALLBACK_TRIGGER_RE = re.compile(
+    "|".join(f"(?P<t{i}>{re.escape(trigger)})" for i, (trigger, _) in enumerate(_FALLBACK_TRIGGERS))
+)
+
+
 class AnswerGeneratorAgent(BaseAgent):
     """
     LLM-powered agent that generates contextual answers to product questions.
@@ -90,9 +143,9 @@ IMPORTANT: Return ONLY the JSON array, no additional text."""),
             prompt_data = {
                 "product_name": product.name,
                 "concentration": product.concentration,
-                "skin_types": ", ".join(product.skin_types),
-                "ingredients": ", ".join(product.key_ingredients),
-                "benefits": ", ".join(product.benefits),
+                "skin_types": product.skin_types_csv,
+                "ingredients": product.ingredients_csv,
+                "benefits": product.benefits_csv,
                 "usage": product.usage_instructions,
                 "side_effects": product.side_effects,
                 "price": product.price,
@@ -150,25 +203,14 @@ IMPORTANT: Return ONLY the JSON array, no additional text."""),
         
         fallback_answers = []
         for question in questions:
-            # Generate basic answers from product data
-            if "what is" in question.question.lower():
-                answer = f"{product.name} is a {product.concentration} serum formulated for {', '.join(product.skin_types)} skin types."
-            elif "ingredient" in question.question.lower():
-                answer = f"{product.name} contains {', '.join(product.key_ingredients)} as key active ingredients."
-            elif "benefit" in question.question.lower():
-                answer = f"{product.name} provides {', '.join(product.benefits).lower()} benefits."
-            elif "how to use" in question.question.lower() or "how do i use" in question.question.lower():
-                answer = product.usage_instructions
-            elif "side effect" in question.question.lower():
-                answer = product.side_effects if (product.side_effects and len(product.side_effects) > 20) else "No significant side effects have been reported for this product. However, it's always recommended to perform a patch test before first use."
-            elif "price" in question.question.lower():
-                answer = f"{product.name} is priced at {product.price}."
-            elif "skin type" in question.question.lower():
-                answer = f"{product.name} is suitable for {', '.join(product.skin_types)} skin types."
-            else:
-                answer = f"For detailed information about {question.question.lower().replace('?', '')}, please refer to the product documentation or consult with a skincare professional."
-            
-            fallback_answers.append(answer)
+            question_lower = question.question.lower()
+            # Lowest trigger index wins, preserving the original check order
+            match_index = min(
+                (int(m.lastgroup[1:]) for m in _FALLBACK_TRIGGER_RE.finditer(question_lower)),
+                default=None
+            )
+            handler = _FALLBACK_TRIGGERS[match_index][1] if match_index is not None else _answer_generic
+            fallback_answers.append(handler(product, question_lower))
         
         return AgentOutput(
             success=True,
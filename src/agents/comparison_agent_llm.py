@@ -11,6 +11,10 @@ from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
 from src.models.product import Product
 
 
+# Keys a comparison result must provide (defined once at import)
+_REQUIRED_COMPARISON_KEYS = ("product_a", "product_b", "comparison_points", "summary", "recommendation")
+
+
 class ComparisonAgentLLM(BaseAgent):
     """
     LLM-powered agent that creates fictional competitors and performs comparisons.
@@ -121,9 +125,9 @@ Benefits: {benefits}"""),
                 "product_name": product_a.name,
                 "concentration": product_a.concentration,
                 "price": product_a.price,
-                "skin_types": ", ".join(product_a.skin_types),
-                "ingredients": ", ".join(product_a.key_ingredients),
-                "benefits": ", ".join(product_a.benefits)
+                "skin_types": product_a.skin_types_csv,
+                "ingredients": product_a.ingredients_csv,
+                "benefits": product_a.benefits_csv
             }
             
             # Single API call for both competitor and comparison
@@ -132,14 +136,7 @@ Benefits: {benefits}"""),
             
             # Build result
             result = {
-                "product_a": {
-                    "name": product_a.name,
-                    "concentration": product_a.concentration,
-                    "skin_types": product_a.skin_types,
-                    "key_ingredients": product_a.key_ingredients,
-                    "benefits": product_a.benefits,
-                    "price": product_a.price
-                },
+                "product_a": product_a.comparison_dict,
                 "product_b": product_b_raw,
                 "comparison_points": response["comparison_points"],
                 "summary": response["summary"],
@@ -173,8 +170,7 @@ Benefits: {benefits}"""),
     
     def _validate_comparison(self, result: dict) -> bool:
         """Validate comparison output for completeness."""
-        required_keys = ["product_a", "product_b", "comparison_points", "summary", "recommendation"]
-        if not all(key in result for key in required_keys):
+        if not all(key in result for key in _REQUIRED_COMPARISON_KEYS):
             self.log("Validation failed: Missing required keys", level="WARNING")
             return False
         
@@ -204,20 +200,13 @@ Benefits: {benefits}"""),
         }
         
         result = {
-            "product_a": {
-                "name": product_a.name,
-                "concentration": product_a.concentration,
-                "skin_types": product_a.skin_types,
-                "key_ingredients": product_a.key_ingredients,
-                "benefits": product_a.benefits,
-                "price": product_a.price
-            },
+            "product_a": product_a.comparison_dict,
             "product_b": product_b,
             "comparison_points": [
                 {"attribute": "Price", "product_a": product_a.price, "product_b": product_b["price"], "winner": product_a.name},
                 {"attribute": "Concentration", "product_a": product_a.concentration, "product_b": product_b["concentration"], "winner": "Comparable"},
                 {"attribute": "Ingredients", "product_a": f"{len(product_a.key_ingredients)} actives", "product_b": f"{len(product_b['key_ingredients'])} actives", "winner": "Comparable"},
-                {"attribute": "Skin Types", "product_a": ", ".join(product_a.skin_types), "product_b": ", ".join(product_b["skin_types"]), "winner": product_b["name"]},
+                {"attribute": "Skin Types", "product_a": product_a.skin_types_csv, "product_b": ", ".join(product_b["skin_types"]), "winner": product_b["name"]},
                 {"attribute": "Benefits", "product_a": f"{len(product_a.benefits)} benefits", "product_b": f"{len(product_b['benefits'])} benefits", "winner": "Comparable"},
             ],
             "summary": {
@@ -8,6 +8,11 @@ from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
 from src.models.product import Product
 
 
+# Raw input fields required to build a Product (defined once at import)
+_REQUIRED_FIELDS = ("product_name", "concentration", "skin_type",
+                    "key_ingredients", "benefits", "how_to_use", "price")
+
+
 class DataParserAgent(BaseAgent):
     """
     Parses raw product data and converts it into validated internal Product model.
@@ -74,7 +79,4 @@ class DataParserAgent(BaseAgent):
         if not isinstance(input_data.data, dict):
             return False
         
-        required_fields = ["product_name", "concentration", "skin_type", 
-                          "key_ingredients", "benefits", "how_to_use", "price"]
-        
-        return all(field in input_data.data for field in required_fields)
+        return all(field in input_data.data for field in _REQUIRED_FIELDS)
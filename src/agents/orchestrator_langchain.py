@@ -12,7 +12,7 @@ from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
 from langchain_core.tools import Tool
-from langchain_core.runnables import RunnableSequence, RunnableLambda
+from langchain_core.runnables import RunnableSequence, RunnableLambda, RunnableParallel
 
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
 from src.agents.data_parser_agent import DataParserAgent
@@ -24,6 +24,18 @@ from src.agents.template_agent import TemplateAgent
 from src.models.product import Product, QuestionSet
 from src.models.outputs import FAQPage, ProductPage, ComparisonPage
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _dump_page_json(page: Dict[str, Any]) -> bytes:
+    """Serialize a page dict to indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(page, option=orjson.OPT_INDENT_2)
+    return json.dumps(page, indent=2, ensure_ascii=False).encode('utf-8')
+
 
 def retry_with_exponential_backoff(
     max_retries: int = 3,
@@ -103,16 +115,20 @@ class LangChainOrchestrator(BaseAgent):
         
         # Initialize Groq LLM via LangChain
         self.log("Initializing Groq LLM via LangChain...")
-        self.llm = ChatGroq(
-            model="llama-3.1-8b-instant",
-            groq_api_key=api_key,
-            temperature=0.7,
-            max_retries=2  # Built-in retry mechanism
-        )
+        llm_settings = {
+            "model": "llama-3.1-8b-instant",
+            "groq_api_key": api_key,
+            "temperature": 0.7,
+            "request_timeout": 30  # Bound each LLM call so retries can kick in
+        }
+        self.llm = ChatGroq(**llm_settings, max_retries=2)  # Built-in retry mechanism
+        # QuestionGeneratorAgent retries transient errors itself; a second retry
+        # layer in the groq client would multiply the attempts per call
+        question_llm = ChatGroq(**llm_settings, max_retries=0)
         
         # Initialize LLM-powered agents
         self.data_parser = DataParserAgent()
-        self.question_generator = QuestionGeneratorAgent(llm=self.llm)
+        self.question_generator = QuestionGeneratorAgent(llm=question_llm)
         self.answer_generator = AnswerGeneratorAgent(llm=self.llm)
         self.comparison_agent = ComparisonAgentLLM(llm=self.llm)
         self.product_page_agent = ProductPageAgent(llm=self.llm)
@@ -137,13 +153,17 @@ class LangChainOrchestrator(BaseAgent):
     
     def _build_workflow_chain(self):
         """Build LangChain RunnableSequence for workflow execution"""
-        # Create workflow steps as LangChain Runnables
+        # Create workflow steps as LangChain Runnables.
+        # The three LLM branches only depend on the parsed product, so they run
+        # concurrently (I/O-bound) instead of serializing their API calls.
         self.workflow_chain = (
             RunnableLambda(self._step_parse_data)
-            | RunnableLambda(self._step_generate_questions)
-            | RunnableLambda(self._step_generate_answers)
-            | RunnableLambda(self._step_generate_comparison)
-            | RunnableLambda(self._step_generate_product_content)
+            | RunnableParallel(
+                faq=RunnableLambda(self._step_generate_questions) | RunnableLambda(self._step_generate_answers),
+                comparison=RunnableLambda(self._step_generate_comparison),
+                product_content=RunnableLambda(self._step_generate_product_content)
+            )
+            | RunnableLambda(self._merge_parallel_steps)
             | RunnableLambda(self._step_format_outputs)
             | RunnableLambda(self._step_save_outputs)
         )
@@ -167,35 +187,36 @@ class LangChainOrchestrator(BaseAgent):
         self.log(f"✓ Parsed: {result.data.name}")
         return self.state
     
+    # Steps 2-5 run as parallel branches (worker threads). They only read the parsed
+    # state and return their own results; _merge_parallel_steps is the single writer.
+    
     @retry_with_exponential_backoff(max_retries=3, initial_delay=1.0)
-    def _step_generate_questions(self, state: WorkflowState) -> WorkflowState:
+    def _step_generate_questions(self, state: WorkflowState) -> Dict[str, Any]:
         """Step 2: Generate questions using LLM"""
-        self._update_state(current_step="generating_questions")
         self.log("\n=== Step 2: Generating Questions with LLM ===")
         
         result = self.question_generator.execute(AgentInput(data=state["product"]))
         if not result.success:
             raise ValueError(f"Question generation failed: {result.errors}")
         
-        self._update_state(questions=result.data)
         self.log(f"✓ Generated {len(result.data.questions)} questions using Groq LLM")
-        return self.state
+        return {"product": state["product"], "questions": result.data}
     
     @retry_with_exponential_backoff(max_retries=3, initial_delay=1.0)
-    def _step_generate_answers(self, state: WorkflowState) -> WorkflowState:
+    def _step_generate_answers(self, faq_branch: Dict[str, Any]) -> Dict[str, Any]:
         """Step 3: Generate answers using LLM (batch mode)"""
-        self._update_state(current_step="generating_answers")
         self.log("\n=== Step 3: Generating Answers with LLM (BATCH MODE) ===")
+        questions = faq_branch["questions"].questions
         
         result = self.answer_generator.execute(
-            AgentInput(data={'product': state["product"], 'questions': state["questions"].questions})
+            AgentInput(data={'product': faq_branch["product"], 'questions': questions})
         )
         if not result.success:
             raise ValueError(f"Answer generation failed: {result.errors}")
         
         # Build FAQ items from batch results
         faq_items = []
-        for i, question in enumerate(state["questions"].questions):
+        for i, question in enumerate(questions):
             if i < len(result.data):
                 faq_items.append({
                     'question': question.question,
@@ -203,36 +224,44 @@ class LangChainOrchestrator(BaseAgent):
                     'category': question.category
                 })
         
-        self._update_state(faq_items=faq_items)
         self.log(f"✓ Generated {len(faq_items)} AI-powered answers")
-        return self.state
+        return {"questions": faq_branch["questions"], "faq_items": faq_items}
     
     @retry_with_exponential_backoff(max_retries=3, initial_delay=1.0)
-    def _step_generate_comparison(self, state: WorkflowState) -> WorkflowState:
+    def _step_generate_comparison(self, state: WorkflowState) -> Dict[str, Any]:
         """Step 4: Generate comparison using LLM"""
-        self._update_state(current_step="generating_comparison")
         self.log("\n=== Step 4: Generating Competitor & Comparison with LLM ===")
         
         result = self.comparison_agent.execute(AgentInput(data=state["product"]))
         if not result.success:
             raise ValueError(f"Comparison generation failed: {result.errors}")
         
-        self._update_state(comparison=result.data)
         self.log(f"✓ Generated fictional competitor: {result.data['product_b']['name']}")
-        return self.state
+        return result.data
     
     @retry_with_exponential_backoff(max_retries=3, initial_delay=1.0)
-    def _step_generate_product_content(self, state: WorkflowState) -> WorkflowState:
+    def _step_generate_product_content(self, state: WorkflowState) -> Dict[str, Any]:
         """Step 5: Generate product page content using LLM"""
-        self._update_state(current_step="generating_product_content")
         self.log("\n=== Step 5: Generating Product Page Content with LLM ===")
         
         result = self.product_page_agent.execute(AgentInput(data=state["product"]))
         if not result.success:
             raise ValueError(f"Product page content generation failed: {result.errors}")
         
-        self._update_state(product_content=result.data)
         self.log("✓ Generated product page content using Groq LLM")
+        return result.data
+    
+    def _merge_parallel_steps(self, branch_results: Dict[str, Any]) -> WorkflowState:
+        """Join point for the parallel LLM branches: write every branch result into state"""
+        faq_branch = branch_results["faq"]
+        self._update_state(
+            questions=faq_branch["questions"],
+            faq_items=faq_branch["faq_items"],
+            comparison=branch_results["comparison"],
+            product_content=branch_results["product_content"],
+            current_step="generation_completed"
+        )
+        self.log(f"✓ Parallel LLM branches completed: {', '.join(branch_results)}")
         return self.state
     
     def _step_format_outputs(self, state: WorkflowState) -> WorkflowState:
@@ -283,9 +312,9 @@ class LangChainOrchestrator(BaseAgent):
         for page_data in state["pages"]:
             page_type = type(page_data).__name__.replace('Page', '').lower()
             file_path = os.path.join(self.output_dir, f"{page_type}_page.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(page_data.model_dump() if hasattr(page_data, 'model_dump') else page_data, 
-                         f, indent=2, ensure_ascii=False)
+            page = page_data.model_dump() if hasattr(page_data, 'model_dump') else page_data
+            with open(file_path, 'wb') as f:
+                f.write(_dump_page_json(page))
             self.log(f"✓ Saved: {file_path}")
         
         self._update_state(current_step="completed")
@@ -7,10 +7,14 @@ from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
-from src.models.product import Product
+from src.models.product import Product, and_join
 from typing import Dict, Any
 
 
+# Keys the LLM product content must provide (defined once at import)
+_REQUIRED_CONTENT_KEYS = ("tagline", "description", "key_features", "precautions")
+
+
 class ProductPageAgent(BaseAgent):
     """
     LLM-powered agent that generates complete product page content using AI.
@@ -92,9 +96,9 @@ Return ONLY the JSON, no additional text."""),
             prompt_data = {
                 "product_name": product.name,
                 "concentration": product.concentration,
-                "skin_types": ", ".join(product.skin_types),
-                "ingredients": ", ".join(product.key_ingredients),
-                "benefits": ", ".join(product.benefits),
+                "skin_types": product.skin_types_csv,
+                "ingredients": product.ingredients_csv,
+                "benefits": product.benefits_csv,
                 "usage": product.usage_instructions,
                 "side_effects": product.side_effects or "None reported",
                 "price": product.price
@@ -127,8 +131,7 @@ Return ONLY the JSON, no additional text."""),
     
     def _validate_product_content(self, content: dict) -> bool:
         """Validate product content for required fields and quality."""
-        required_keys = ["tagline", "description", "key_features", "precautions"]
-        if not all(key in content for key in required_keys):
+        if not all(key in content for key in _REQUIRED_CONTENT_KEYS):
             self.log("Validation failed: Missing required keys", level="WARNING")
             return False
         
@@ -157,6 +160,7 @@ Return ONLY the JSON, no additional text."""),
         
         primary_benefit = product.benefits[0] if product.benefits else "skincare"
         primary_ingredient = product.key_ingredients[0] if product.key_ingredients else "active ingredients"
+        sensitive_skin_note = bool(product.side_effects) and "sensitive" in product.side_effects.lower()
         
         # Generate realistic precautions based on product data
         precautions = [
@@ -168,12 +172,12 @@ Return ONLY the JSON, no additional text."""),
         if any("vitamin c" in ing.lower() or "acid" in ing.lower() for ing in product.key_ingredients):
             precautions.append("Use sunscreen during the day when using this product")
         
-        if product.side_effects and "sensitive" in product.side_effects.lower():
+        if sensitive_skin_note:
             precautions.append("May cause tingling for sensitive skin - discontinue if irritation occurs")
         
         fallback_content = {
             "tagline": f"{primary_benefit.title()} with {primary_ingredient}",
-            "description": f"{product.name} is a {product.concentration} serum designed for {' and '.join(product.skin_types)} skin. Formulated with {', '.join(product.key_ingredients)}, it delivers {' and '.join(product.benefits).lower()} benefits. {product.usage_instructions}",
+            "description": f"{product.name} is a {product.concentration} serum designed for {and_join(product.skin_types)} skin. Formulated with {', '.join(product.key_ingredients)}, it delivers {and_join(product.benefits).lower()} benefits. {product.usage_instructions}",
             "key_features": [
                 f"{product.concentration} formulation",
                 f"Suitable for {' & '.join(product.skin_types)} skin",
@@ -190,7 +194,7 @@ Return ONLY the JSON, no additional text."""),
                 "tips": product.usage_instructions
             },
             "precautions": precautions,
-            "suitable_for_sensitive_skin": "with caution" if (product.side_effects and "sensitive" in product.side_effects.lower()) else "consult dermatologist"
+            "suitable_for_sensitive_skin": "with caution" if sensitive_skin_note else "consult dermatologist"
         }
         
         return AgentOutput(
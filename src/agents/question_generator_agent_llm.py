@@ -3,33 +3,34 @@ LLM-powered QuestionGeneratorAgent using LangChain and Groq.
 Generates 15+ categorized questions using AI instead of templates.
 """
 
-from typing import List
+from typing import Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+import hashlib
 import json
+import os
+import sqlite3
+import httpx
+from groq import APIConnectionError, InternalServerError, RateLimitError
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential, wait_random
 from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_core.output_parsers import JsonOutputParser
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
+from pydantic import ValidationError
 from src.models.product import Product, CategorizedQuestion, QuestionSet
 
 
-class QuestionGeneratorAgent(BaseAgent):
-    """
-    LLM-powered agent that generates diverse categorized questions.
-    
-    Input: Product instance
-    Output: QuestionSet with 15+ AI-generated categorized questions
-    """
-    
-    def __init__(self, llm: ChatGroq):
-        super().__init__(
-            agent_id="question_generator_agent",
-            description="Generates categorized user questions using LLM"
-        )
-        self.llm = llm
-        
-        # Define prompt for question generation
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at generating realistic user questions about skincare products.
+# Transient Groq/network errors worth retrying before falling back to templates
+TRANSIENT_LLM_ERRORS = (httpx.HTTPError, APIConnectionError, RateLimitError, InternalServerError)
+
+# Total LLM attempts per question set, including the first call
+LLM_MAX_ATTEMPTS = 3
+
+
+# Static part of the system prompt (literal JSON example, no template escaping needed)
+SYSTEM_STATIC = """You are an expert at generating realistic user questions about skincare products.
             
 Generate exactly 20 diverse questions across these categories:
 - Informational (4 questions): What is it, what does it do, key features
@@ -44,11 +45,14 @@ Generate natural, conversational questions a real user would ask.
 
 Return ONLY a JSON array with this exact structure:
 [
-  {{"category": "Informational", "question": "What is the product?", "priority": 1}},
-  {{"category": "Usage", "question": "How do I use it?", "priority": 1}}
+  {"category": "Informational", "question": "What is the product?", "priority": 1},
+  {"category": "Usage", "question": "How do I use it?", "priority": 1}
 ]
 
-Product Details:
+"""
+
+# Per-product tail of the system prompt, filled with str.format
+PRODUCT_BLOCK_TMPL = """Product Details:
 Name: {product_name}
 Concentration: {concentration}
 Skin Types: {skin_types}
@@ -56,11 +60,159 @@ Ingredients: {ingredients}
 Benefits: {benefits}
 Usage: {usage}
 Side Effects: {side_effects}
-Price: {price}"""),
-            ("human", "Generate 20 diverse questions. Return ONLY the JSON array, no other text.")
-        ])
+Price: {price}"""
+
+HUMAN_MESSAGE = HumanMessage(content="Generate 20 diverse questions. Return ONLY the JSON array, no other text.")
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "question_llm.sqlite")
+
+# Fingerprint of the prompt text; part of every cache key so prompt edits invalidate old entries
+PROMPT_VERSION = hashlib.sha256(
+    (SYSTEM_STATIC + PRODUCT_BLOCK_TMPL + HUMAN_MESSAGE.content).encode("utf-8")
+).hexdigest()[:16]
+
+
+class QuestionCache:
+    """
+    Two-level cache for validated LLM question sets.
+    
+    L1: in-process LRU (OrderedDict) of serialized sets for hot keys.
+    L2: SQLite in WAL mode, shared by worker processes and surviving restarts.
+    SQLite errors degrade to L1-only caching rather than failing generation.
+    
+    Both levels hold JSON and every hit is parsed afresh, so callers never share
+    a mutable QuestionSet with the cache or with each other.
+    """
+    
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, maxsize: int = 128):
+        """
+        Initialize cache.
+        
+        Args:
+            path: SQLite file for the shared L2 cache (None for in-process only)
+            maxsize: Maximum number of entries kept in the L1 LRU
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._l1: "OrderedDict[str, str]" = OrderedDict()
+        
+        if self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with self._connect() as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS question_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                    )
+            except (OSError, sqlite3.Error):
+                self.path = None
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a short-lived connection (safe across threads and processes).
+        
+        The transaction is committed (or rolled back) and the connection closed on exit;
+        sqlite3's own context manager only does the former.
+        """
+        with closing(sqlite3.connect(self.path, timeout=5)) as conn, conn:
+            yield conn
+    
+    def get(self, key: str) -> Optional[QuestionSet]:
+        """Look up a question set in L1, then L2 (promoting L2 hits into L1)."""
+        value = self._l1.get(key)
+        if value is None and self.path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT value FROM question_cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                value = row[0]
+        
+        if value is not None:
+            try:
+                question_set = QuestionSet.model_validate_json(value)
+            except ValueError:
+                # Undecodable or no longer valid (pydantic's ValidationError is a ValueError)
+                self._l1.pop(key, None)
+                self._delete_l2(key)
+            else:
+                self._store_l1(key, value)
+                self.hits += 1
+                return question_set
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key: str, question_set: QuestionSet):
+        """Store a validated question set in both cache levels."""
+        value = question_set.model_dump_json()
+        self._store_l1(key, value)
+        if self.path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO question_cache (key, value) VALUES (?, ?)",
+                        (key, value)
+                    )
+            except sqlite3.Error:
+                pass
+    
+    def _delete_l2(self, key: str):
+        """Drop a stale L2 row so the next miss regenerates and overwrites it."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM question_cache WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+    
+    def _store_l1(self, key: str, value: str):
+        """Insert (or refresh) a serialized set in the L1 LRU, evicting the least recently used entry."""
+        self._l1[key] = value
+        self._l1.move_to_end(key)
+        if len(self._l1) > self.maxsize:
+            self._l1.popitem(last=False)
+    
+    def cache_info(self) -> Tuple[int, int, int]:
+        """Return (hits, misses, size) for metrics; size counts L2 entries when persistent."""
+        size = len(self._l1)
+        if self.path:
+            try:
+                with self._connect() as conn:
+                    size = conn.execute("SELECT COUNT(*) FROM question_cache").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return self.hits, self.misses, size
+
+
+class QuestionGeneratorAgent(BaseAgent):
+    """
+    LLM-powered agent that generates diverse categorized questions.
+    
+    Input: Product instance
+    Output: QuestionSet with 15+ AI-generated categorized questions
+    """
+    
+    REQUIRED_CATEGORIES = frozenset({"Informational", "Usage", "Safety"})
+    
+    def __init__(self, llm: ChatGroq, cache_size: int = 128, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+        super().__init__(
+            agent_id="question_generator_agent",
+            description="Generates categorized user questions using LLM"
+        )
+        self.llm = llm
+        
+        # Exact-match cache of validated LLM question sets, keyed by prompt version,
+        # model and product fields (the L2 cache is persistent and has no TTL)
+        self.cache = QuestionCache(path=cache_path, maxsize=cache_size)
+        model_name = getattr(llm, "model_name", None)
+        self._cache_namespace = f"{PROMPT_VERSION}|{model_name if isinstance(model_name, str) else ''}"
         
-        self.chain = self.prompt | self.llm | JsonOutputParser()
+        # Static prompt text is pre-rendered at import; only the product block is formatted per call
+        self.chain = RunnableLambda(self._build_messages) | self.llm | JsonOutputParser()
     
     def execute(self, input_data: AgentInput) -> AgentOutput:
         """
@@ -75,13 +227,30 @@ Price: {price}"""),
         try:
             product: Product = input_data.data
             
-            # Prepare product data for prompt
+            # Cache hit: skip prompt construction and the LLM call entirely
+            cache_key = self._cache_key(product)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.log(f"Cache hit for {product.name}, reusing {len(cached.questions)} questions")
+                return AgentOutput(
+                    success=True,
+                    data=cached,
+                    metadata={
+                        "total_questions": len(cached.questions),
+                        "categories": cached.categories,
+                        "generation_method": "LLM (Groq via LangChain)",
+                        "validation_passed": True,
+                        "cache_hit": True
+                    }
+                )
+            
+            # Prepare product data for prompt (cache miss only)
             prompt_data = {
                 "product_name": product.name,
                 "concentration": product.concentration,
-                "skin_types": ", ".join(product.skin_types),
-                "ingredients": ", ".join(product.key_ingredients),
-                "benefits": ", ".join(product.benefits),
+                "skin_types": product.skin_types_csv,
+                "ingredients": product.ingredients_csv,
+                "benefits": product.benefits_csv,
                 "usage": product.usage_instructions,
                 "side_effects": product.side_effects,
                 "price": product.price
@@ -89,20 +258,25 @@ Price: {price}"""),
             
             # Generate questions using LLM
             self.log(f"Generating questions for {product.name} using Groq...")
-            questions_raw = self.chain.invoke(prompt_data)
+            questions_raw, retries = self._invoke_with_retry(prompt_data)
             
-            # Convert to CategorizedQuestion objects
+            # Convert to CategorizedQuestion objects, dropping only items that fail validation
+            # (e.g. an out-of-vocabulary category) rather than discarding the whole response
             questions: List[CategorizedQuestion] = []
             categories = set()
             
             for q_data in questions_raw:
-                question = CategorizedQuestion(
-                    category=q_data["category"],
-                    question=q_data["question"],
-                    priority=q_data.get("priority", 1)
-                )
+                try:
+                    question = CategorizedQuestion(
+                        category=q_data["category"],
+                        question=q_data["question"],
+                        priority=q_data.get("priority", 1)
+                    )
+                except ValidationError as e:
+                    self.log(f"Dropping invalid question {q_data!r}: {e.errors()[0]['msg']}", level="WARNING")
+                    continue
                 questions.append(question)
-                categories.add(q_data["category"])
+                categories.add(question.category)
             
             # Create question set
             question_set = QuestionSet(
@@ -117,6 +291,8 @@ Price: {price}"""),
                 self.log("LLM output validation failed, using fallback", level="WARNING")
                 return self._fallback_questions(product)
             
+            self.cache.set(cache_key, question_set)
+            
             return AgentOutput(
                 success=True,
                 data=question_set,
@@ -124,7 +300,9 @@ Price: {price}"""),
                     "total_questions": len(questions),
                     "categories": list(categories),
                     "generation_method": "LLM (Groq via LangChain)",
-                    "validation_passed": True
+                    "validation_passed": True,
+                    "cache_hit": False,
+                    "retries": retries
                 }
             )
             
@@ -133,27 +311,72 @@ Price: {price}"""),
             self.log("Attempting fallback strategy...", level="WARNING")
             return self._fallback_questions(product)
     
+    @staticmethod
+    def _build_messages(prompt_data: dict) -> list:
+        """Assemble chat messages from the pre-rendered static prompt and the product block."""
+        return [
+            SystemMessage(content=SYSTEM_STATIC + PRODUCT_BLOCK_TMPL.format(**prompt_data)),
+            HUMAN_MESSAGE
+        ]
+    
+    def _invoke_with_retry(self, prompt_data: dict):
+        """
+        Invoke the LLM chain, retrying transient errors with jittered exponential backoff.
+        
+        Parsing/validation errors are not retried; they propagate to the fallback path.
+        This is the only retry layer, so the LLM should be built with max_retries=0.
+        
+        Returns:
+            Tuple of (parsed LLM response, number of retries performed)
+        """
+        stop = stop_after_attempt(LLM_MAX_ATTEMPTS)
+        retryer = Retrying(
+            stop=stop,
+            wait=wait_exponential(multiplier=0.5, max=4) + wait_random(0, 1),
+            retry=retry_if_exception_type(TRANSIENT_LLM_ERRORS),
+            before_sleep=lambda state: self.log(
+                f"Transient LLM error (attempt {state.attempt_number}/{stop.max_attempt_number}): "
+                f"{state.outcome.exception()}. Retrying...",
+                level="WARNING"
+            ),
+            reraise=True
+        )
+        response = retryer(self.chain.invoke, prompt_data)
+        return response, retryer.statistics.get("attempt_number", 1) - 1
+    
+    def _cache_key(self, product: Product) -> str:
+        """Build a SHA256 cache key from the prompt/model namespace and raw Product fields."""
+        raw = (
+            f"{self._cache_namespace}|{product.name}|{product.concentration}|{tuple(sorted(product.skin_types))}|"
+            f"{tuple(sorted(product.key_ingredients))}|{tuple(sorted(product.benefits))}|"
+            f"{product.usage_instructions}|{product.side_effects}|{product.price}"
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def cache_info(self) -> Tuple[int, int, int]:
+        """Return (hits, misses, size) of the question cache."""
+        return self.cache.cache_info()
+    
     def _validate_questions(self, questions: list) -> bool:
-        """Validate LLM-generated questions for quality and completeness."""
+        """Validate LLM-generated questions for quality and completeness (single pass)."""
         if not questions or len(questions) < 15:
             self.log(f"Validation failed: Only {len(questions)} questions generated (minimum 15)", level="WARNING")
             return False
         
-        required_categories = {"Informational", "Usage", "Safety"}
-        found_categories = {q.category for q in questions}
-        
-        if not required_categories.issubset(found_categories):
-            self.log(f"Validation failed: Missing required categories", level="WARNING")
-            return False
-        
-        # Check question quality
+        found_categories = set()
         for q in questions:
-            if not q.question or len(q.question) < 10:
+            text = q.question
+            if not text or len(text) < 10:
                 self.log(f"Validation failed: Invalid question format", level="WARNING")
                 return False
-            if not q.question.strip().endswith('?'):
+            if not text.rstrip().endswith('?'):
                 self.log(f"Validation failed: Questions must end with '?'", level="WARNING")
                 return False
+            found_categories.add(q.category)
+        
+        if not self.REQUIRED_CATEGORIES.issubset(found_categories):
+            self.log(f"Validation failed: Missing required categories", level="WARNING")
+            return False
         
         self.log("LLM output validation passed", level="DEBUG")
         return True
@@ -183,9 +406,10 @@ Price: {price}"""),
             CategorizedQuestion(category="Results", question=f"What results can I expect from {product.name}?", priority=1),
         ]
         
+        # categories is derived from the questions by QuestionSet.extract_categories
         question_set = QuestionSet(
             questions=fallback_questions,
-            categories=["Informational", "Usage", "Safety", "Skin Type", "Purchase", "Comparison", "Results"]
+            categories=[]
         )
         
         return AgentOutput(
@@ -5,19 +5,65 @@ NO GENERATION - only formatting pre-generated LLM content.
 """
 
 from typing import Dict, Any
+from functools import singledispatch
 import re
+import sys
+from types import MappingProxyType
 from src.agents.base_agent import BaseAgent, AgentInput, AgentOutput
 from src.models.product import Product, QuestionSet
-from src.models.outputs import FAQItem, FAQPage, ProductPage, ComparisonPage, ComparisonItem
+from src.models.outputs import FAQ_PAGE_ADAPTER, PRODUCT_PAGE_ADAPTER, COMPARISON_PAGE_ADAPTER
+
+
+# Compiled once at import; matches the numeric part of prices like "₹699"
+_PRICE_RE = re.compile(r'₹?(\d+)')
+
+# Static default values shared by every formatted page (interned once at import)
+_AS_DIRECTED = sys.intern("as directed")
+_INR = sys.intern("INR")
+_PRODUCT_PRICE = sys.intern("product price")
+_NONE_REPORTED = sys.intern("None reported")
+_NONE = sys.intern("None")
+_CONSULT_DERMATOLOGIST = sys.intern("Consult dermatologist")
+_DEFAULT_PRECAUTIONS = ("Consult product packaging",)
+
+# Usage guide used only when the LLM content omits usage_highlights
+# (full_instructions is product-specific and filled in at call time)
+_DEFAULT_USAGE_BASE = MappingProxyType({
+    "timing": _AS_DIRECTED,
+    "application_amount": _AS_DIRECTED,
+    "application_order": _AS_DIRECTED,
+    "frequency": _AS_DIRECTED
+})
+
+
+@singledispatch
+def _to_product_dict(product) -> Dict[str, Any]:
+    """Normalize a product (dict or Product) into the comparison dict shape."""
+    raise TypeError(f"Unsupported product type: {type(product).__name__}")
+
+
+@_to_product_dict.register(dict)
+def _(product: dict) -> Dict[str, Any]:
+    return product
+
+
+@_to_product_dict.register(Product)
+def _(product: Product) -> Dict[str, Any]:
+    # The snapshot is a read-only mapping; a plain dict takes pydantic's fast path
+    return dict(product.comparison_dict)
 
 
 class TemplateAgent(BaseAgent):
     """
-    Structures LLM-generated content into validated JSON schemas.
-    No hardcoded generation - only formatting and validation.
+    Structures LLM-generated content into JSON schemas.
+    No hardcoded generation - only formatting.
     
     Input: Dict with page_type, product data, and LLM-generated content
     Output: Structured page (FAQPage, ProductPage, or ComparisonPage)
+    
+    Each page is built as a plain payload dict and validated once through its
+    prebuilt TypeAdapter, which is cheaper than constructing the nested models
+    one by one.
     """
     
     def __init__(self):
@@ -26,7 +72,7 @@ class TemplateAgent(BaseAgent):
             description="Structures AI-generated content into JSON schemas"
         )
     
-    def _generate_faq_page(self, faq_items: list, product_name: str) -> FAQPage:
+    def _generate_faq_page(self, faq_items: list, product_name: str) -> Dict[str, Any]:
         """
         Generate FAQ page from pre-generated LLM answers.
         
@@ -35,27 +81,28 @@ class TemplateAgent(BaseAgent):
             product_name: Product name
             
         Returns:
-            FAQPage instance
+            FAQPage payload
         """
-        # Convert to FAQItem objects
-        from src.models.outputs import FAQItem
-        faq_objs = [
-            FAQItem(
-                question=item['question'],
-                answer=item['answer'],
-                category=item['category']
-            ) for item in faq_items
-        ]
+        # Collect FAQ entries and categories (first-seen order) in one pass
+        faqs = []
+        categories = {}
+        for item in faq_items:
+            faqs.append({
+                "question": item['question'],
+                "answer": item['answer'],
+                "category": item['category']
+            })
+            categories[item['category']] = None
         
         # Create FAQ page
-        return FAQPage(
-            product_name=product_name,
-            total_questions=len(faq_objs),
-            categories=list(set([item['category'] for item in faq_items])),
-            faqs=faq_objs
-        )
+        return {
+            "product_name": product_name,
+            "total_questions": len(faqs),
+            "categories": list(categories),
+            "faqs": faqs
+        }
     
-    def _generate_product_page(self, product: Product, product_content: Dict[str, Any]) -> ProductPage:
+    def _generate_product_page(self, product: Product, product_content: Dict[str, Any]) -> Dict[str, Any]:
         """
         Format product page from LLM-generated content.
         Pure formatter - NO generation, only structuring LLM output.
@@ -65,52 +112,53 @@ class TemplateAgent(BaseAgent):
             product_content: LLM-generated content (ALL fields must be provided)
             
         Returns:
-            ProductPage instance
+            ProductPage payload
         """
         # Extract pricing data (only data extraction, no generation)
-        import re
-        price_match = re.search(r'₹?(\d+)', product.price)
+        price_match = _PRICE_RE.search(product.price)
         price_value = int(price_match.group(1)) if price_match else 0
         
         pricing = {
             "price": product.price,
             "price_value": str(price_value),
-            "currency": "INR",
-            "value_rating": "product price"
+            "currency": _INR,
+            "value_rating": _PRODUCT_PRICE
         }
         
-        # Use LLM-generated content directly - NO fallback generation
-        usage_guide = product_content.get('usage_highlights', {
-            "timing": "as directed",
-            "application_amount": "as directed",
-            "full_instructions": product.usage_instructions,
-            "application_order": "as directed",
-            "frequency": "as directed"
-        })
+        # Use LLM-generated content directly - defaults are only built when missing
+        usage_guide = product_content.get('usage_highlights')
+        if not usage_guide:
+            usage_guide = {**_DEFAULT_USAGE_BASE, "full_instructions": product.usage_instructions}
         
         # Use LLM-generated safety info - NO hardcoded content
-        safety_info = product_content.get('safety_information', {
-            "side_effects": product.side_effects or "None reported",
-            "precautions": product_content.get('precautions', ["Consult product packaging"]),
-            "suitable_for_sensitive_skin": product_content.get('suitable_for_sensitive_skin', "Consult dermatologist"),
-            "warnings": product.side_effects if product.side_effects else "None"
-        })
+        safety_info = product_content.get('safety_information')
+        if not safety_info:
+            safety_info = {
+                "side_effects": product.side_effects or _NONE_REPORTED,
+                "precautions": product_content.get('precautions', _DEFAULT_PRECAUTIONS),
+                "suitable_for_sensitive_skin": product_content.get('suitable_for_sensitive_skin', _CONSULT_DERMATOLOGIST),
+                "warnings": product.side_effects if product.side_effects else _NONE
+            }
+        
+        ingredients = product_content.get('ingredient_descriptions')
+        if ingredients is None:
+            ingredients = dict(zip(product.key_ingredients, product.key_ingredients))
         
         # Create product page using 100% LLM-generated content
-        return ProductPage(
-            product_name=product.name,
-            tagline=product_content.get('tagline', product.name),
-            description=product_content.get('description', f"{product.name} serum"),
-            key_features=product_content.get('key_features', []),
-            ingredients=product_content.get('ingredient_descriptions', {ing: ing for ing in product.key_ingredients}),
-            usage_guide=usage_guide,
-            suitable_for=product.skin_types,
-            benefits=product.benefits,
-            safety_information=safety_info,
-            pricing=pricing
-        )
+        return {
+            "product_name": product.name,
+            "tagline": product_content.get('tagline', product.name),
+            "description": product_content.get('description', f"{product.name} serum"),
+            "key_features": product_content.get('key_features', []),
+            "ingredients": ingredients,
+            "usage_guide": usage_guide,
+            "suitable_for": product.skin_types,
+            "benefits": product.benefits,
+            "safety_information": safety_info,
+            "pricing": pricing
+        }
     
-    def _generate_comparison_page(self, comparison_data: Dict[str, Any]) -> ComparisonPage:
+    def _generate_comparison_page(self, comparison_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate comparison page using comparison template.
         
@@ -118,48 +166,42 @@ class TemplateAgent(BaseAgent):
             comparison_data: Dict with product_a, product_b, comparison_points, etc.
             
         Returns:
-            ComparisonPage instance
+            ComparisonPage payload
         """
-        product_a = comparison_data["product_a"]
-        product_b = comparison_data["product_b"]
-        
-        # Handle both Product objects and dicts
-        if isinstance(product_a, dict):
-            product_a_dict = product_a
-        else:
-            product_a_dict = {
-                "name": product_a.name,
-                "concentration": product_a.concentration,
-                "skin_types": product_a.skin_types,
-                "key_ingredients": product_a.key_ingredients,
-                "benefits": product_a.benefits,
-                "price": product_a.price
-            }
-        
-        if isinstance(product_b, dict):
-            product_b_dict = product_b
-        else:
-            product_b_dict = {
-                "name": product_b.name,
-                "concentration": product_b.concentration,
-                "skin_types": product_b.skin_types,
-                "key_ingredients": product_b.key_ingredients,
-                "benefits": product_b.benefits,
-                "price": product_b.price
-            }
-        
-        return ComparisonPage(
-            product_a=product_a_dict,
-            product_b=product_b_dict,
-            comparison_points=comparison_data["comparison_points"],
-            summary=comparison_data["summary"],
-            recommendation=comparison_data["recommendation"]
-        )
+        # Handle both Product objects and dicts; comparison points may be dicts
+        # or ComparisonItem instances, both of which the adapter accepts as-is
+        return {
+            "product_a": _to_product_dict(comparison_data["product_a"]),
+            "product_b": _to_product_dict(comparison_data["product_b"]),
+            "comparison_points": comparison_data["comparison_points"],
+            "summary": comparison_data["summary"],
+            "recommendation": comparison_data["recommendation"]
+        }
+    
+    def _run_faq(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._generate_faq_page(data["faq_items"], data["product_name"])
+    
+    def _run_product_page(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._generate_product_page(data["product"], data["product_content"])
+    
+    def _run_comparison(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._generate_comparison_page(data["comparison_data"])
+    
+    # page_type -> (payload builder, required input keys, validating adapter);
+    # shared by execute and validate_input
+    _PAGE_HANDLERS = {
+        "faq": (_run_faq, ("faq_items", "product_name"), FAQ_PAGE_ADAPTER),
+        "product_page": (_run_product_page, ("product", "product_content"), PRODUCT_PAGE_ADAPTER),
+        "comparison": (_run_comparison, ("comparison_data",), COMPARISON_PAGE_ADAPTER)
+    }
     
     def execute(self, input_data: AgentInput) -> AgentOutput:
         """
         Apply appropriate template and generate page.
         
+        Expects input that satisfies validate_input; missing keys surface as
+        a failed AgentOutput rather than being silently defaulted.
+        
         Args:
             input_data: Contains page_type and relevant data
             
@@ -167,24 +209,13 @@ class TemplateAgent(BaseAgent):
             AgentOutput with generated page
         """
         try:
-            page_type = input_data.data.get("page_type")
+            data = input_data.data
+            page_type = data["page_type"]
             
-            if page_type == "faq":
-                faq_items = input_data.data.get("faq_items")
-                product_name = input_data.data.get("product_name")
-                page = self._generate_faq_page(faq_items, product_name)
-                
-            elif page_type == "product_page":
-                product = input_data.data.get("product")
-                product_content = input_data.data.get("product_content")
-                page = self._generate_product_page(product, product_content)
-                
-            elif page_type == "comparison":
-                comparison_data = input_data.data.get("comparison_data")
-                page = self._generate_comparison_page(comparison_data)
-                
-            else:
+            handler = self._PAGE_HANDLERS.get(page_type)
+            if handler is None:
                 raise ValueError(f"Unknown page type: {page_type}")
+            page = handler[2].validate_python(handler[0](self, data))
             
             return AgentOutput(
                 success=True,
@@ -208,16 +239,9 @@ class TemplateAgent(BaseAgent):
         if not isinstance(input_data.data, dict):
             return False
         
-        page_type = input_data.data.get("page_type")
-        if page_type not in ["faq", "product_page", "comparison"]:
+        handler = self._PAGE_HANDLERS.get(input_data.data.get("page_type"))
+        if handler is None:
             return False
         
-        # Check required data for each page type
-        if page_type == "faq":
-            return "faq_items" in input_data.data and "product_name" in input_data.data
-        elif page_type == "product_page":
-            return "product" in input_data.data and "product_content" in input_data.data
-        elif page_type == "comparison":
-            return "comparison_data" in input_data.data
-        
-        return False
+        # Check required data for this page type
+        return all(key in input_data.data for key in handler[1])
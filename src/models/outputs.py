@@ -4,12 +4,14 @@ Defines the structure of final JSON outputs.
 """
 
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class FAQItem(BaseModel):
     """Single FAQ entry."""
     
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     question: str = Field(..., description="User question")
     answer: str = Field(..., description="Detailed answer")
     category: str = Field(..., description="Question category")
@@ -18,6 +20,8 @@ class FAQItem(BaseModel):
 class FAQPage(BaseModel):
     """FAQ page output structure."""
     
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     page_type: str = Field(default="faq", description="Page type identifier")
     product_name: str = Field(..., description="Product name")
     total_questions: int = Field(..., description="Total number of FAQs")
@@ -29,6 +33,8 @@ class FAQPage(BaseModel):
 class ProductPage(BaseModel):
     """Product description page output structure."""
     
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     page_type: str = Field(default="product_page", description="Page type identifier")
     product_name: str = Field(..., description="Product name")
     tagline: str = Field(..., description="Product tagline")
@@ -46,6 +52,8 @@ class ProductPage(BaseModel):
 class ComparisonItem(BaseModel):
     """Single comparison point."""
     
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     attribute: str = Field(..., description="Attribute being compared")
     product_a: Any = Field(..., description="Product A value")
     product_b: Any = Field(..., description="Product B value")
@@ -55,6 +63,8 @@ class ComparisonItem(BaseModel):
 class ComparisonPage(BaseModel):
     """Comparison page output structure."""
     
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     page_type: str = Field(default="comparison", description="Page type identifier")
     product_a: Dict[str, Any] = Field(..., description="First product details")
     product_b: Dict[str, Any] = Field(..., description="Second product details")
@@ -62,3 +72,9 @@ class ComparisonPage(BaseModel):
     summary: Dict[str, Any] = Field(..., description="Comparison summary")
     recommendation: str = Field(..., description="Recommendation based on comparison")
     generated_by: str = Field(default="Multi-Agent System", description="System identifier")
+
+
+# Prebuilt validators for validating untrusted page payloads (built once at import)
+FAQ_PAGE_ADAPTER = TypeAdapter(FAQPage)
+PRODUCT_PAGE_ADAPTER = TypeAdapter(ProductPage)
+COMPARISON_PAGE_ADAPTER = TypeAdapter(ComparisonPage)
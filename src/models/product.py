@@ -3,42 +3,112 @@ Core data models for the product content generation system.
 Defines clean internal representations with validation.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+import sys
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+from functools import cached_property
+from types import MappingProxyType
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+# Question categories the generators emit; interned so validated categories compare by identity
+VALID_CATEGORIES = frozenset(map(sys.intern, (
+    "Informational", "Usage", "Safety", "Skin Type", "Purchase", "Comparison", "Results"
+)))
+
+# Case/whitespace-insensitive lookup so LLM variants like "skin  type" map to "Skin Type"
+_CATEGORY_LOOKUP = {category.casefold(): category for category in VALID_CATEGORIES}
+
+
+def and_join(items: Sequence[str]) -> str:
+    """Join items with ' and ', skipping str.join for the common 1-2 item case."""
+    n = len(items)
+    if n == 1:
+        return items[0]
+    if n == 2:
+        return f"{items[0]} and {items[1]}"
+    return " and ".join(items)
 
 
 class Product(BaseModel):
-    """Internal representation of a product with validated fields."""
+    """
+    Internal representation of a product with validated fields.
+    
+    Immutable: the model is frozen and its sequence fields are tuples, because the
+    joined/derived cached properties below are computed once per instance. Use
+    model_copy(update=...) for variants; it builds a freshly validated instance.
+    """
     
     name: str = Field(..., description="Product name")
     concentration: str = Field(..., description="Active ingredient concentration")
-    skin_types: List[str] = Field(..., description="Compatible skin types")
-    key_ingredients: List[str] = Field(..., description="Main ingredients")
-    benefits: List[str] = Field(..., description="Product benefits")
+    skin_types: Tuple[str, ...] = Field(..., description="Compatible skin types")
+    key_ingredients: Tuple[str, ...] = Field(..., description="Main ingredients")
+    benefits: Tuple[str, ...] = Field(..., description="Product benefits")
     usage_instructions: str = Field(..., description="How to use the product")
     side_effects: Optional[str] = Field(None, description="Potential side effects")
     price: str = Field(..., description="Product price")
     
-    @validator('skin_types', 'key_ingredients', 'benefits', pre=True)
+    @field_validator('skin_types', 'key_ingredients', 'benefits', mode='before')
+    @classmethod
     def split_comma_separated(cls, v):
-        """Convert comma-separated strings to lists."""
-        if isinstance(v, str):
+        """Convert comma-separated strings to lists (stored as tuples)."""
+        # Exact type check skips the isinstance MRO walk; parsed JSON never yields str subclasses
+        if type(v) is str:
             return [item.strip() for item in v.split(',')]
         return v
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "name": "GlowBoost Vitamin C Serum",
-                "concentration": "10% Vitamin C",
-                "skin_types": ["Oily", "Combination"],
-                "key_ingredients": ["Vitamin C", "Hyaluronic Acid"],
-                "benefits": ["Brightening", "Fades dark spots"],
-                "usage_instructions": "Apply 2–3 drops in the morning before sunscreen",
-                "side_effects": "Mild tingling for sensitive skin",
-                "price": "₹699"
-            }
+    # Joined forms used by prompts and answers, computed once per instance
+    @cached_property
+    def skin_types_csv(self) -> str:
+        """Skin types as a comma-separated string."""
+        return ", ".join(self.skin_types)
+    
+    @cached_property
+    def ingredients_csv(self) -> str:
+        """Key ingredients as a comma-separated string."""
+        return ", ".join(self.key_ingredients)
+    
+    @cached_property
+    def benefits_csv(self) -> str:
+        """Benefits as a comma-separated string."""
+        return ", ".join(self.benefits)
+    
+    @cached_property
+    def benefits_lower(self) -> str:
+        """Lowercased benefits_csv for inline use in answers."""
+        return self.benefits_csv.lower()
+    
+    @cached_property
+    def comparison_dict(self) -> Mapping[str, Any]:
+        """Fields shown on comparison pages, as a read-only snapshot built once per instance."""
+        return MappingProxyType({
+            "name": self.name,
+            "concentration": self.concentration,
+            "skin_types": self.skin_types,
+            "key_ingredients": self.key_ingredients,
+            "benefits": self.benefits,
+            "price": self.price
+        })
+    
+    def model_copy(self, *, update=None, deep: bool = False):
+        """Copy the product; updates are validated like constructor input."""
+        if not update:
+            # Every field is immutable, so cached derived values carried over stay correct
+            return super().model_copy(deep=deep)
+        return self.model_validate({**self.model_dump(), **update})
+    
+    model_config = ConfigDict(frozen=True, json_schema_extra={
+        "example": {
+            "name": "GlowBoost Vitamin C Serum",
+            "concentration": "10% Vitamin C",
+            "skin_types": ["Oily", "Combination"],
+            "key_ingredients": ["Vitamin C", "Hyaluronic Acid"],
+            "benefits": ["Brightening", "Fades dark spots"],
+            "usage_instructions": "Apply 2–3 drops in the morning before sunscreen",
+            "side_effects": "Mild tingling for sensitive skin",
+            "price": "₹699"
         }
+    })
 
 
 class CategorizedQuestion(BaseModel):
@@ -48,14 +118,22 @@ class CategorizedQuestion(BaseModel):
     question: str = Field(..., description="The actual question")
     priority: int = Field(default=1, description="Priority level for ordering")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "category": "Usage",
-                "question": "How often should I use GlowBoost Vitamin C Serum?",
-                "priority": 1
-            }
+    @field_validator('category')
+    @classmethod
+    def check_category(cls, v):
+        """Normalise a category to its interned canonical spelling; reject unknown labels."""
+        canonical = _CATEGORY_LOOKUP.get(" ".join(v.split()).casefold())
+        if canonical is None:
+            raise ValueError(f"Unknown question category: {v}")
+        return canonical
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "category": "Usage",
+            "question": "How often should I use GlowBoost Vitamin C Serum?",
+            "priority": 1
         }
+    })
 
 
 class QuestionSet(BaseModel):
@@ -64,26 +142,24 @@ class QuestionSet(BaseModel):
     questions: List[CategorizedQuestion] = Field(..., description="All generated questions")
     categories: List[str] = Field(..., description="List of unique categories")
     
-    @validator('categories', always=True)
-    def extract_categories(cls, v, values):
-        """Auto-extract unique categories from questions."""
-        if 'questions' in values:
-            return list(set(q.category for q in values['questions']))
-        return v
+    @model_validator(mode='after')
+    def extract_categories(self):
+        """Auto-extract unique categories from questions, in first-seen order."""
+        self.categories = list(dict.fromkeys(q.category for q in self.questions))
+        return self
 
 
-class ContentBlock(BaseModel):
-    """Represents a reusable content logic block output."""
+@dataclass(frozen=True)
+class ContentBlock:
+    """Represents a reusable content logic block output (internal, not validated)."""
     
-    block_type: str = Field(..., description="Type of content block")
-    content: dict = Field(..., description="Generated content data")
-    dependencies: List[str] = Field(default_factory=list, description="Required input fields")
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "block_type": "benefits_block",
-                "content": {"benefits": ["Brightens skin", "Reduces dark spots"]},
-                "dependencies": ["product.benefits"]
-            }
-        }
+    block_type: str  # Type of content block
+    content: Mapping[str, Any]  # Generated content data
+    dependencies: Tuple[str, ...] = ()  # Required input fields
+
+
+CONTENT_BLOCK_EXAMPLE = {
+    "block_type": "benefits_block",
+    "content": {"benefits": ["Brightens skin", "Reduces dark spots"]},
+    "dependencies": ("product.benefits",)
+}
@@ -1,12 +1,19 @@
 """
 Template definitions for different page types.
 Each template defines structure, fields, rules, and required content blocks.
+
+Templates are built in code rather than parsed from untrusted input, so they
+are plain frozen dataclasses instead of validated pydantic models.
 """
 
+import sys
+from dataclasses import dataclass, field as dataclass_field
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
 from enum import Enum
 
+# slots=True is only accepted by dataclass on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class TemplateType(str, Enum):
     """Supported template types."""
@@ -15,57 +22,56 @@ class TemplateType(str, Enum):
     COMPARISON = "comparison"
 
 
-class TemplateField(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class TemplateField:
     """Defines a single field in a template."""
     
-    name: str = Field(..., description="Field name")
-    field_type: str = Field(..., description="Data type (string, list, dict, etc.)")
-    required: bool = Field(default=True, description="Whether field is mandatory")
-    source_block: Optional[str] = Field(None, description="Content block that provides this field")
-    default_value: Optional[Any] = Field(None, description="Default value if not provided")
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "name": "product_name",
-                "field_type": "string",
-                "required": True,
-                "source_block": "product_info_block"
-            }
-        }
+    name: str  # Field name
+    field_type: str  # Data type (string, list, dict, etc.)
+    required: bool = True  # Whether field is mandatory
+    source_block: Optional[str] = None  # Content block that provides this field
+    default_value: Optional[Any] = None  # Default value if not provided
+
 
+TEMPLATE_FIELD_EXAMPLE = {
+    "name": "product_name",
+    "field_type": "string",
+    "required": True,
+    "source_block": "product_info_block"
+}
 
-class TemplateRule(BaseModel):
+
+@dataclass(frozen=True, **_SLOTS)
+class TemplateRule:
     """Defines a transformation or validation rule."""
     
-    rule_type: str = Field(..., description="Type of rule (transform, validate, format)")
-    field: str = Field(..., description="Field to apply rule to")
-    logic: str = Field(..., description="Rule logic description")
-    parameters: Dict[str, Any] = Field(default_factory=dict, description="Rule parameters")
+    rule_type: str  # Type of rule (transform, validate, format)
+    field: str  # Field to apply rule to
+    logic: str  # Rule logic description
+    parameters: Dict[str, Any] = dataclass_field(default_factory=dict)  # Rule parameters
 
 
-class Template(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class Template:
     """Complete template definition for a page type."""
     
-    template_type: TemplateType = Field(..., description="Type of template")
-    name: str = Field(..., description="Template name")
-    description: str = Field(..., description="What this template generates")
-    fields: List[TemplateField] = Field(..., description="All fields in the template")
-    rules: List[TemplateRule] = Field(default_factory=list, description="Transformation rules")
-    required_blocks: List[str] = Field(..., description="Content blocks needed for this template")
-    output_schema: Dict[str, Any] = Field(..., description="Expected JSON output structure")
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "template_type": "faq",
-                "name": "FAQ Page Template",
-                "description": "Generates FAQ page with Q&A pairs",
-                "fields": [
-                    {"name": "title", "field_type": "string", "required": True},
-                    {"name": "questions", "field_type": "list", "required": True}
-                ],
-                "required_blocks": ["question_generator_block", "answer_generator_block"],
-                "output_schema": {"title": "str", "faqs": "list[dict]"}
-            }
-        }
+    template_type: TemplateType  # Type of template
+    name: str  # Template name
+    description: str  # What this template generates
+    fields: List[TemplateField]  # All fields in the template
+    required_blocks: List[str]  # Content blocks needed for this template
+    output_schema: Dict[str, Any]  # Expected JSON output structure
+    rules: List[TemplateRule] = dataclass_field(default_factory=list)  # Transformation rules
+
+
+TEMPLATE_EXAMPLE = {
+    "template_type": "faq",
+    "name": "FAQ Page Template",
+    "description": "Generates FAQ page with Q&A pairs",
+    "fields": [
+        {"name": "title", "field_type": "string", "required": True},
+        {"name": "questions", "field_type": "list", "required": True}
+    ],
+    "required_blocks": ["question_generator_block", "answer_generator_block"],
+    "output_schema": {"title": "str", "faqs": "list[dict]"}
+}
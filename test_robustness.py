@@ -5,16 +5,57 @@ Tests the new comprehensive error handling and resilience features.
 
 import pytest
 import os
-from src.agents.question_generator_agent_llm import QuestionGeneratorAgent
-from src.agents.answer_generator_agent_llm import AnswerGeneratorAgent
-from src.agents.comparison_agent_llm import ComparisonAgentLLM
-from src.agents.product_page_agent_llm import ProductPageAgent
 from src.agents.base_agent import AgentInput
 from src.models.product import Product, CategorizedQuestion
-from langchain_groq import ChatGroq
 from unittest.mock import Mock, patch
 
 
+def _mk_q(category, question):
+    """Build a trusted CategorizedQuestion without running validators"""
+    return CategorizedQuestion.model_construct(category=category, question=question, priority=1)
+
+
+# Minimal question set that passes QuestionGeneratorAgent validation, built once per session
+_VALID_QUESTIONS = [
+    _mk_q("Informational", "What is the product?"),
+    _mk_q("Informational", "What are the ingredients?"),
+    _mk_q("Informational", "What are the benefits?"),
+    _mk_q("Informational", "What is the concentration?"),
+    _mk_q("Usage", "How to use it?"),
+    _mk_q("Usage", "When to apply?"),
+    _mk_q("Usage", "How much to use?"),
+    _mk_q("Safety", "Any side effects?"),
+    _mk_q("Safety", "Is it safe?"),
+    _mk_q("Safety", "What precautions?"),
+] + [
+    _mk_q("Results", f"Question {i}?")
+    for i in range(5)
+]
+
+
+def _llm_question_payload(categories, n=16):
+    """Raw LLM question list cycling through categories, as the parsed chain output"""
+    return [
+        {"category": categories[i % len(categories)], "question": f"Is this test question {i}?", "priority": 1}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def serum_product():
+    """Shared test product, built once per module without re-running validators"""
+    return Product.model_construct(
+        name="Test Serum",
+        concentration="10% Vitamin C",
+        skin_types=["Oily", "Combination"],
+        key_ingredients=["Vitamin C", "Hyaluronic Acid"],
+        benefits=["Brightening", "Hydration"],
+        usage_instructions="Apply 2-3 drops in the morning",
+        side_effects="None reported",
+        price="₹899"
+    )
+
+
 def test_logging_infrastructure():
     """Test that logging infrastructure is properly initialized"""
     from src.agents.data_parser_agent import DataParserAgent
@@ -38,75 +79,54 @@ def test_logging_infrastructure():
     agent.log("Test error", level="ERROR")
 
 
-def test_question_validation():
+def test_question_validation(question_agent):
     """Test question validation rejects invalid LLM outputs"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = QuestionGeneratorAgent(llm=mock_llm)
-    
     # Test: Too few questions
     invalid_questions_few = [
-        CategorizedQuestion(category="Informational", question="What is it?", priority=1),
-        CategorizedQuestion(category="Usage", question="How to use?", priority=1),
+        _mk_q("Informational", "What is it?"),
+        _mk_q("Usage", "How to use?"),
     ]
-    assert agent._validate_questions(invalid_questions_few) == False
+    assert question_agent._validate_questions(invalid_questions_few) == False
     
     # Test: Missing required category
     invalid_questions_category = [
-        CategorizedQuestion(category="Purchase", question=f"Question {i}?", priority=1)
+        _mk_q("Purchase", f"Question {i}?")
         for i in range(15)
     ]
-    assert agent._validate_questions(invalid_questions_category) == False
+    assert question_agent._validate_questions(invalid_questions_category) == False
     
     # Test: Invalid question format (no question mark)
     invalid_questions_format = [
-        CategorizedQuestion(category="Informational", question="What is it", priority=1),
+        _mk_q("Informational", "What is it"),
     ] + [
-        CategorizedQuestion(category="Usage", question=f"Question {i}?", priority=1)
+        _mk_q("Usage", f"Question {i}?")
         for i in range(14)
     ]
-    assert agent._validate_questions(invalid_questions_format) == False
+    assert question_agent._validate_questions(invalid_questions_format) == False
     
     # Test: Valid questions
-    valid_questions = [
-        CategorizedQuestion(category="Informational", question="What is the product?", priority=1),
-        CategorizedQuestion(category="Informational", question="What are the ingredients?", priority=1),
-        CategorizedQuestion(category="Informational", question="What are the benefits?", priority=1),
-        CategorizedQuestion(category="Informational", question="What is the concentration?", priority=1),
-        CategorizedQuestion(category="Usage", question="How to use it?", priority=1),
-        CategorizedQuestion(category="Usage", question="When to apply?", priority=1),
-        CategorizedQuestion(category="Usage", question="How much to use?", priority=1),
-        CategorizedQuestion(category="Safety", question="Any side effects?", priority=1),
-        CategorizedQuestion(category="Safety", question="Is it safe?", priority=1),
-        CategorizedQuestion(category="Safety", question="What precautions?", priority=1),
-    ] + [
-        CategorizedQuestion(category="Results", question=f"Question {i}?", priority=1)
-        for i in range(5)
-    ]
-    assert agent._validate_questions(valid_questions) == True
+    assert question_agent._validate_questions(_VALID_QUESTIONS) == True
 
 
-def test_answer_validation():
+def test_answer_validation(answer_agent):
     """Test answer validation rejects invalid LLM outputs"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = AnswerGeneratorAgent(llm=mock_llm)
-    
     questions = [
-        CategorizedQuestion(category="Informational", question="What is it?", priority=1),
-        CategorizedQuestion(category="Usage", question="How to use?", priority=1),
-        CategorizedQuestion(category="Safety", question="Is it safe?", priority=1),
+        _mk_q("Informational", "What is it?"),
+        _mk_q("Usage", "How to use?"),
+        _mk_q("Safety", "Is it safe?"),
     ]
     
     # Test: Answer count mismatch
     invalid_answers_count = ["Answer 1", "Answer 2"]
-    assert agent._validate_answers(invalid_answers_count, questions) == False
+    assert answer_agent._validate_answers(invalid_answers_count, questions) == False
     
     # Test: Empty answers
     invalid_answers_empty = ["", "Answer 2", "Answer 3"]
-    assert agent._validate_answers(invalid_answers_empty, questions) == False
+    assert answer_agent._validate_answers(invalid_answers_empty, questions) == False
     
     # Test: Too short answers
     invalid_answers_short = ["Short", "Also short", "Too short"]
-    assert agent._validate_answers(invalid_answers_short, questions) == False
+    assert answer_agent._validate_answers(invalid_answers_short, questions) == False
     
     # Test: Valid answers
     valid_answers = [
@@ -114,21 +134,18 @@ def test_answer_validation():
         "This is another detailed answer that provides useful information to users.",
         "This answer also meets the minimum length requirement for validation."
     ]
-    assert agent._validate_answers(valid_answers, questions) == True
+    assert answer_agent._validate_answers(valid_answers, questions) == True
 
 
-def test_comparison_validation():
+def test_comparison_validation(comparison_agent):
     """Test comparison validation rejects invalid LLM outputs"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = ComparisonAgentLLM(llm=mock_llm)
-    
     # Test: Missing required keys
     invalid_comparison_keys = {
         "product_a": {},
         "product_b": {},
         "comparison_points": []
     }
-    assert agent._validate_comparison(invalid_comparison_keys) == False
+    assert comparison_agent._validate_comparison(invalid_comparison_keys) == False
     
     # Test: Too few comparison points
     invalid_comparison_points = {
@@ -138,7 +155,7 @@ def test_comparison_validation():
         "summary": "Summary",
         "recommendation": "Recommendation"
     }
-    assert agent._validate_comparison(invalid_comparison_points) == False
+    assert comparison_agent._validate_comparison(invalid_comparison_points) == False
     
     # Test: Missing competitor name
     invalid_comparison_name = {
@@ -148,7 +165,7 @@ def test_comparison_validation():
         "summary": "Summary",
         "recommendation": "Recommendation"
     }
-    assert agent._validate_comparison(invalid_comparison_name) == False
+    assert comparison_agent._validate_comparison(invalid_comparison_name) == False
     
     # Test: Valid comparison
     valid_comparison = {
@@ -158,19 +175,16 @@ def test_comparison_validation():
         "summary": {"winner": "A", "key_differences": "Differences"},
         "recommendation": "Choose A"
     }
-    assert agent._validate_comparison(valid_comparison) == True
+    assert comparison_agent._validate_comparison(valid_comparison) == True
 
 
-def test_product_content_validation():
+def test_product_content_validation(product_page_agent):
     """Test product content validation rejects invalid LLM outputs"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = ProductPageAgent(llm=mock_llm)
-    
     # Test: Missing required keys
     invalid_content_keys = {
         "tagline": "Tagline only"
     }
-    assert agent._validate_product_content(invalid_content_keys) == False
+    assert product_page_agent._validate_product_content(invalid_content_keys) == False
     
     # Test: Tagline too short
     invalid_content_tagline = {
@@ -179,7 +193,7 @@ def test_product_content_validation():
         "key_features": ["Feature 1", "Feature 2", "Feature 3"],
         "precautions": ["Precaution 1", "Precaution 2"]
     }
-    assert agent._validate_product_content(invalid_content_tagline) == False
+    assert product_page_agent._validate_product_content(invalid_content_tagline) == False
     
     # Test: Description too short
     invalid_content_description = {
@@ -188,7 +202,7 @@ def test_product_content_validation():
         "key_features": ["Feature 1", "Feature 2", "Feature 3"],
         "precautions": ["Precaution 1", "Precaution 2"]
     }
-    assert agent._validate_product_content(invalid_content_description) == False
+    assert product_page_agent._validate_product_content(invalid_content_description) == False
     
     # Test: Too few features
     invalid_content_features = {
@@ -197,7 +211,7 @@ def test_product_content_validation():
         "key_features": ["Feature 1"],
         "precautions": ["Precaution 1", "Precaution 2"]
     }
-    assert agent._validate_product_content(invalid_content_features) == False
+    assert product_page_agent._validate_product_content(invalid_content_features) == False
     
     # Test: Too few precautions
     invalid_content_precautions = {
@@ -206,7 +220,7 @@ def test_product_content_validation():
         "key_features": ["Feature 1", "Feature 2", "Feature 3"],
         "precautions": ["Only one"]
     }
-    assert agent._validate_product_content(invalid_content_precautions) == False
+    assert product_page_agent._validate_product_content(invalid_content_precautions) == False
     
     # Test: Valid content
     valid_content = {
@@ -215,26 +229,12 @@ def test_product_content_validation():
         "key_features": ["Feature 1", "Feature 2", "Feature 3", "Feature 4"],
         "precautions": ["Precaution 1", "Precaution 2", "Precaution 3"]
     }
-    assert agent._validate_product_content(valid_content) == True
+    assert product_page_agent._validate_product_content(valid_content) == True
 
 
-def test_fallback_question_generation():
+def test_fallback_question_generation(serum_product, question_agent):
     """Test fallback question generation works when LLM fails"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = QuestionGeneratorAgent(llm=mock_llm)
-    
-    product = Product(
-        name="Test Serum",
-        concentration="10% Vitamin C",
-        skin_types=["Oily", "Combination"],
-        key_ingredients=["Vitamin C", "Hyaluronic Acid"],
-        benefits=["Brightening", "Hydration"],
-        usage_instructions="Apply 2-3 drops",
-        side_effects="None",
-        price="₹899"
-    )
-    
-    result = agent._fallback_questions(product)
+    result = question_agent._fallback_questions(serum_product)
     
     assert result.success == True
     assert result.data is not None
@@ -243,29 +243,15 @@ def test_fallback_question_generation():
     assert result.metadata.get("generation_method") == "Fallback (Template-based)"
 
 
-def test_fallback_answer_generation():
+def test_fallback_answer_generation(serum_product, answer_agent):
     """Test fallback answer generation works when LLM fails"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = AnswerGeneratorAgent(llm=mock_llm)
-    
-    product = Product(
-        name="Test Serum",
-        concentration="10% Vitamin C",
-        skin_types=["Oily", "Combination"],
-        key_ingredients=["Vitamin C", "Hyaluronic Acid"],
-        benefits=["Brightening", "Hydration"],
-        usage_instructions="Apply 2-3 drops in the morning",
-        side_effects="None reported",
-        price="₹899"
-    )
-    
     questions = [
-        CategorizedQuestion(category="Informational", question="What is Test Serum?", priority=1),
-        CategorizedQuestion(category="Usage", question="How do I use Test Serum?", priority=1),
-        CategorizedQuestion(category="Safety", question="Are there any side effects?", priority=1),
+        _mk_q("Informational", "What is Test Serum?"),
+        _mk_q("Usage", "How do I use Test Serum?"),
+        _mk_q("Safety", "Are there any side effects?"),
     ]
     
-    result = agent._fallback_answers(product, questions)
+    result = answer_agent._fallback_answers(serum_product, questions)
     
     assert result.success == True
     assert len(result.data) == len(questions)
@@ -275,23 +261,9 @@ def test_fallback_answer_generation():
         assert len(answer) > 20
 
 
-def test_fallback_comparison_generation():
+def test_fallback_comparison_generation(serum_product, comparison_agent):
     """Test fallback comparison generation works when LLM fails"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = ComparisonAgentLLM(llm=mock_llm)
-    
-    product = Product(
-        name="Test Serum",
-        concentration="10% Vitamin C",
-        skin_types=["Oily", "Combination"],
-        key_ingredients=["Vitamin C", "Hyaluronic Acid"],
-        benefits=["Brightening", "Hydration"],
-        usage_instructions="Apply 2-3 drops",
-        side_effects="None",
-        price="₹899"
-    )
-    
-    result = agent._fallback_comparison(product)
+    result = comparison_agent._fallback_comparison(serum_product)
     
     assert result.success == True
     assert result.data["product_b"]["name"] is not None
@@ -299,29 +271,22 @@ def test_fallback_comparison_generation():
     assert result.metadata.get("fallback_used") == True
 
 
-def test_fallback_product_content_generation():
+def test_fallback_product_content_generation(serum_product, product_page_agent):
     """Test fallback product content generation works when LLM fails"""
-    mock_llm = Mock(spec=ChatGroq)
-    agent = ProductPageAgent(llm=mock_llm)
-    
-    product = Product(
-        name="Test Serum",
-        concentration="10% Vitamin C",
-        skin_types=["Oily", "Combination"],
-        key_ingredients=["Vitamin C", "Hyaluronic Acid"],
-        benefits=["Brightening", "Hydration"],
-        usage_instructions="Apply 2-3 drops in the morning",
-        side_effects="None reported",
-        price="₹899"
-    )
-    
-    result = agent._fallback_product_content(product)
+    result = product_page_agent._fallback_product_content(serum_product)
     
     assert result.success == True
     assert "tagline" in result.data
     assert "description" in result.data
     assert len(result.data["key_features"]) >= 3
     assert result.metadata.get("fallback_used") == True
+    
+    # Each call builds fresh content, so mutating one result must not leak into the next
+    result.data["key_features"].append("Injected")
+    result.data["usage_highlights"]["timing"] = "never"
+    again = product_page_agent._fallback_product_content(serum_product)
+    assert "Injected" not in again.data["key_features"]
+    assert again.data["usage_highlights"]["timing"] == "morning"
 
 
 def test_retry_mechanism_exists():
@@ -347,5 +312,173 @@ def test_retry_mechanism_exists():
     assert call_count == 3  # Failed twice, succeeded on third attempt
 
 
+def test_orchestrator_merges_parallel_branch_results(tmp_path, serum_product):
+    """Test parallel branches return their results and the merge step writes them into state"""
+    from src.agents.base_agent import AgentOutput
+    from src.agents.orchestrator_langchain import LangChainOrchestrator
+    from src.models.product import QuestionSet
+    
+    # The real QuestionGeneratorAgent would open the on-disk cache; it is replaced below anyway
+    with patch.dict(os.environ, {"GROQ_API_KEY": "test-key"}), \
+            patch("src.agents.orchestrator_langchain.QuestionGeneratorAgent"):
+        orchestrator = LangChainOrchestrator(output_dir=str(tmp_path))
+    
+    question_set = QuestionSet(questions=_VALID_QUESTIONS, categories=[])
+    answers = [f"Detailed answer number {i} for this question." for i in range(len(_VALID_QUESTIONS))]
+    comparison = {
+        "product_a": serum_product,
+        "product_b": {"name": "Rival Serum", "price": "₹799"},
+        "comparison_points": [
+            {"attribute": f"Point {i}", "product_a": "A", "product_b": "B", "winner": "A"} for i in range(5)
+        ],
+        "summary": {"winner": "Test Serum"},
+        "recommendation": "Choose Test Serum"
+    }
+    product_content = {
+        "tagline": "Brightening with Vitamin C",
+        "description": "A brightening serum with enough detail to pass validation.",
+        "key_features": ["Feature 1", "Feature 2", "Feature 3"],
+        "precautions": ["Patch test", "Avoid eyes"]
+    }
+    
+    orchestrator.data_parser = Mock(execute=Mock(return_value=AgentOutput(success=True, data=serum_product)))
+    orchestrator.question_generator = Mock(execute=Mock(return_value=AgentOutput(success=True, data=question_set)))
+    orchestrator.answer_generator = Mock(execute=Mock(return_value=AgentOutput(success=True, data=answers)))
+    orchestrator.comparison_agent = Mock(execute=Mock(return_value=AgentOutput(success=True, data=comparison)))
+    orchestrator.product_page_agent = Mock(execute=Mock(return_value=AgentOutput(success=True, data=product_content)))
+    
+    result = orchestrator.execute(AgentInput(data={}))
+    
+    assert result.success == True
+    state = orchestrator.state
+    assert state["questions"] is question_set
+    assert len(state["faq_items"]) == len(_VALID_QUESTIONS)
+    assert state["faq_items"][0] == {
+        "question": _VALID_QUESTIONS[0].question, "answer": answers[0], "category": "Informational"
+    }
+    assert state["comparison"] is comparison
+    assert state["product_content"] is product_content
+    assert state["current_step"] == "completed"
+    assert len(state["pages"]) == 3
+    assert sorted(os.listdir(tmp_path)) == ["comparison_page.json", "faq_page.json", "product_page.json"]
+
+
+def test_question_cache_hit_skips_llm(tmp_path, serum_product, mock_llm):
+    """Test exact-match cache returns stored questions without re-invoking the LLM"""
+    from src.agents.question_generator_agent_llm import QuestionGeneratorAgent
+    
+    cache_path = str(tmp_path / "question_llm.sqlite")
+    agent = QuestionGeneratorAgent(llm=mock_llm, cache_path=cache_path)
+    
+    agent.chain = Mock()
+    agent.chain.invoke.return_value = _llm_question_payload(["Informational", "Usage", "Safety", "Results"])
+    
+    first = agent.execute(AgentInput(data=serum_product))
+    second = agent.execute(AgentInput(data=serum_product))
+    
+    assert first.metadata.get("cache_hit") == False
+    assert second.metadata.get("cache_hit") == True
+    assert second.data == first.data
+    
+    # Hits are independent copies; mutating one can't leak into the cache
+    second.data.questions.clear()
+    third = agent.execute(AgentInput(data=serum_product))
+    assert len(third.data.questions) == 16
+    assert agent.chain.invoke.call_count == 1
+    assert agent.cache_info() == (2, 1, 1)
+    
+    # A fresh agent (e.g. another worker process) shares hits via the SQLite cache
+    other = QuestionGeneratorAgent(llm=mock_llm, cache_path=cache_path)
+    other.chain = Mock()
+    result = other.execute(AgentInput(data=serum_product))
+    
+    assert result.metadata.get("cache_hit") == True
+    assert len(result.data.questions) == 16
+    other.chain.invoke.assert_not_called()
+
+
+def test_question_cache_discards_invalid_rows(tmp_path, serum_product, mock_llm):
+    """Test an undecodable or no-longer-valid SQLite row is a miss, not a permanent fallback"""
+    import sqlite3
+    import json
+    from src.agents.question_generator_agent_llm import QuestionGeneratorAgent
+    
+    cache_path = str(tmp_path / "question_llm.sqlite")
+    agent = QuestionGeneratorAgent(llm=mock_llm, cache_path=cache_path)
+    key = agent._cache_key(serum_product)
+    stale = json.dumps({
+        "questions": [{"category": "Ingredients", "question": "What is in it?", "priority": 1}],
+        "categories": ["Ingredients"]
+    })
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute("INSERT INTO question_cache (key, value) VALUES (?, ?)", (key, stale))
+    
+    agent.chain = Mock()
+    agent.chain.invoke.return_value = _llm_question_payload(["Informational", "Usage", "Safety", "Results"])
+    
+    result = agent.execute(AgentInput(data=serum_product))
+    
+    assert result.success == True
+    assert result.metadata.get("cache_hit") == False
+    assert result.metadata.get("fallback_used") is None
+    assert agent.chain.invoke.call_count == 1
+    
+    # The regenerated set replaced the stale row and is served to other workers
+    other = QuestionGeneratorAgent(llm=mock_llm, cache_path=cache_path)
+    assert other.cache.get(key) is not None
+
+
+def test_question_cache_key_tracks_prompt_and_model(serum_product):
+    """Test cache keys change with the model so persistent entries never leak across models"""
+    from src.agents.question_generator_agent_llm import QuestionGeneratorAgent
+    
+    agent_a = QuestionGeneratorAgent(llm=Mock(model_name="llama-3.1-8b-instant"), cache_path=None)
+    agent_b = QuestionGeneratorAgent(llm=Mock(model_name="llama-3.3-70b-versatile"), cache_path=None)
+    
+    assert agent_a._cache_key(serum_product) != agent_b._cache_key(serum_product)
+    
+    with patch("src.agents.question_generator_agent_llm.PROMPT_VERSION", "changed"):
+        agent_c = QuestionGeneratorAgent(llm=Mock(model_name="llama-3.1-8b-instant"), cache_path=None)
+    assert agent_a._cache_key(serum_product) != agent_c._cache_key(serum_product)
+
+
+def test_question_generation_drops_only_invalid_categories(serum_product, question_agent):
+    """Test one out-of-vocabulary category drops that question, not the whole LLM response"""
+    question_agent.chain = Mock()
+    question_agent.chain.invoke.return_value = _llm_question_payload(
+        ["Informational", "Usage", "Safety", "skin type"]
+    ) + [{"category": "Ingredients", "question": "What is in it?", "priority": 1}]
+    
+    result = question_agent.execute(AgentInput(data=serum_product))
+    
+    assert result.success == True
+    assert result.metadata.get("fallback_used") is None
+    assert len(result.data.questions) == 16
+    assert "Skin Type" in result.data.categories
+    assert "Ingredients" not in result.data.categories
+
+
+def test_question_generation_retries_transient_errors(serum_product, mock_llm):
+    """Test transient LLM errors are retried instead of falling straight to fallback"""
+    import httpx
+    from src.agents.question_generator_agent_llm import QuestionGeneratorAgent
+    
+    agent = QuestionGeneratorAgent(llm=mock_llm, cache_path=None)
+    
+    agent.chain = Mock()
+    agent.chain.invoke.side_effect = [
+        httpx.ConnectError("Simulated connection reset"),
+        _llm_question_payload(["Informational", "Usage", "Safety", "Results"])
+    ]
+    
+    with patch("time.sleep"):
+        result = agent.execute(AgentInput(data=serum_product))
+    
+    assert result.success == True
+    assert result.metadata.get("fallback_used") is None
+    assert result.metadata.get("retries") == 1
+    assert agent.chain.invoke.call_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -2,119 +2,146 @@
 """
 Setup verification script to ensure environment is correctly configured.
 Checks dependencies, API keys, and system requirements.
+
+Each check is a probe returning (passed, detail_lines); main() runs the CHECKS
+spec once and renders the results. Directory listings are shared between
+probes so each directory is scanned at most once per run.
 """
 
 import sys
 import os
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
 
-def check_python_version():
+def _listing(directory, listings):
+    """Names of the entries in a directory (empty if missing), scanned once per run"""
+    if directory not in listings:
+        try:
+            with os.scandir(directory) as entries:
+                listings[directory] = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            listings[directory] = set()
+    return listings[directory]
+
+
+def _partition_paths(paths, listings):
+    """Split relative paths into (present, missing) sets using the shared directory listings"""
+    present = set()
+    for path in paths:
+        parent, name = os.path.split(path)
+        if name in _listing(parent or ".", listings):
+            present.add(path)
+    return present, set(paths) - present
+
+
+def _probe_python_version(listings):
     """Verify Python version >= 3.8"""
-    print("🐍 Checking Python version...")
     version = sys.version_info
     if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print(f"   ❌ Python {version.major}.{version.minor} detected. Python 3.8+ required.")
-        return False
-    print(f"   ✅ Python {version.major}.{version.minor}.{version.micro}")
-    return True
+        return False, [f"   ❌ Python {version.major}.{version.minor} detected. Python 3.8+ required."]
+    return True, [f"   ✅ Python {version.major}.{version.minor}.{version.micro}"]
 
 
-def check_dependencies():
+# Keyed by distribution name; reading dist-info metadata avoids importing each package
+REQUIRED_PACKAGES = {
+    "pydantic": "2.0.0",
+    "langchain": "0.3.13",
+    "langchain-groq": "0.2.1",
+    "langchain-core": "0.3.28",
+    "python-dotenv": "1.0.0",
+    "tenacity": "8.2.0",
+    "pytest": "7.0.0"
+}
+
+
+def _probe_dependencies(listings):
     """Verify required packages are installed"""
-    print("\n📦 Checking dependencies...")
-    required = {
-        "pydantic": "2.0.0",
-        "langchain": "0.3.13",
-        "langchain_groq": "0.2.1",
-        "langchain_core": "0.3.28",
-        "dotenv": "1.0.0",
-        "pytest": "7.0.0"
-    }
-    
+    details = []
     missing = []
-    for package, min_version in required.items():
+    for package in REQUIRED_PACKAGES:
         try:
-            if package == "dotenv":
-                __import__("dotenv")
-            else:
-                __import__(package.replace("-", "_"))
-            print(f"   ✅ {package}")
-        except ImportError:
-            print(f"   ❌ {package} not found")
+            installed = distribution(package).version
+            details.append(f"   ✅ {package} {installed}")
+        except PackageNotFoundError:
+            details.append(f"   ❌ {package} not found")
             missing.append(package)
     
     if missing:
-        print(f"\n   Install missing packages: pip install {' '.join(missing)}")
-        return False
-    return True
+        details.append(f"\n   Install missing packages: pip install {' '.join(missing)}")
+    return not missing, details
 
 
-def check_env_file():
+def _probe_env_file(listings):
     """Verify .env file exists with API key"""
-    print("\n🔑 Checking environment configuration...")
-    env_path = Path(".env")
-    
-    if not env_path.exists():
-        print("   ❌ .env file not found")
-        print("   Create .env file with: GROQ_API_KEY=your_key_here")
-        return False
-    
-    with open(env_path, 'r') as f:
-        content = f.read()
-        if "GROQ_API_KEY" not in content:
-            print("   ❌ GROQ_API_KEY not found in .env")
-            return False
-        if "your_key_here" in content or "=" not in content:
-            print("   ⚠️  .env exists but API key may not be configured")
-            print("   Ensure .env contains: GROQ_API_KEY=your_actual_api_key")
-            return False
-    
-    print("   ✅ .env file configured")
-    return True
+    if ".env" not in _listing(".", listings):
+        return False, ["   ❌ .env file not found",
+                       "   Create .env file with: GROQ_API_KEY=your_key_here"]
+    
+    # Byte-level substring checks; no need to decode the file
+    content = Path(".env").read_bytes()
+    if b"GROQ_API_KEY" not in content:
+        return False, ["   ❌ GROQ_API_KEY not found in .env"]
+    if b"your_key_here" in content or b"=" not in content:
+        return False, ["   ⚠️  .env exists but API key may not be configured",
+                       "   Ensure .env contains: GROQ_API_KEY=your_actual_api_key"]
+    
+    return True, ["   ✅ .env file configured"]
+
+
+REQUIRED_DIRS = ("src", "src/agents", "src/models", "output")
 
+REQUIRED_FILES = (
+    "main.py",
+    "requirements.txt",
+    "src/agents/orchestrator_langchain.py",
+    "src/agents/base_agent.py",
+    "src/models/product.py"
+)
 
-def check_directory_structure():
+
+def _probe_directory_structure(listings):
     """Verify required directories exist"""
-    print("\n📁 Checking directory structure...")
-    required_dirs = ["src", "src/agents", "src/models", "output"]
-    
-    all_exist = True
-    for dir_name in required_dirs:
-        dir_path = Path(dir_name)
-        if not dir_path.exists():
-            print(f"   ❌ {dir_name}/ not found")
-            all_exist = False
-        else:
-            print(f"   ✅ {dir_name}/")
+    _, missing = _partition_paths(REQUIRED_DIRS, listings)
+    details = [f"   ❌ {dir_name}/ not found" if dir_name in missing else f"   ✅ {dir_name}/"
+               for dir_name in REQUIRED_DIRS]
     
     # Create output and logs directories if missing
     for dir_name in ["output", "logs"]:
         Path(dir_name).mkdir(exist_ok=True)
     
-    return all_exist
+    return not missing, details
 
 
-def check_core_files():
+def _probe_core_files(listings):
     """Verify core system files exist"""
-    print("\n📄 Checking core files...")
-    required_files = [
-        "main.py",
-        "requirements.txt",
-        "src/agents/orchestrator_langchain.py",
-        "src/agents/base_agent.py",
-        "src/models/product.py"
-    ]
-    
-    all_exist = True
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            print(f"   ❌ {file_path}")
-            all_exist = False
-        else:
-            print(f"   ✅ {file_path}")
-    
-    return all_exist
+    _, missing = _partition_paths(REQUIRED_FILES, listings)
+    details = [f"   ❌ {file_path}" if file_path in missing else f"   ✅ {file_path}"
+               for file_path in REQUIRED_FILES]
+    return not missing, details
+
+
+# (summary label, section heading, probe) in run order
+CHECKS = (
+    ("Python Version", "🐍 Checking Python version...", _probe_python_version),
+    ("Dependencies", "\n📦 Checking dependencies...", _probe_dependencies),
+    ("Environment Config", "\n🔑 Checking environment configuration...", _probe_env_file),
+    ("Directory Structure", "\n📁 Checking directory structure...", _probe_directory_structure),
+    ("Core Files", "\n📄 Checking core files...", _probe_core_files)
+)
+
+
+def run_checks():
+    """Run every probe in CHECKS once, print its details, and return [(label, passed)]"""
+    listings = {}
+    results = []
+    for label, heading, probe in CHECKS:
+        passed, details = probe(listings)
+        print(heading)
+        for line in details:
+            print(line)
+        results.append((label, passed))
+    return results
 
 
 def main():
@@ -123,13 +150,7 @@ def main():
     print("Kasparro Multi-Agent System - Setup Verification")
     print("="*60)
     
-    checks = [
-        ("Python Version", check_python_version()),
-        ("Dependencies", check_dependencies()),
-        ("Environment Config", check_env_file()),
-        ("Directory Structure", check_directory_structure()),
-        ("Core Files", check_core_files())
-    ]
+    checks = run_checks()
     
     print("\n" + "="*60)
     print("VERIFICATION SUMMARY")